@@ -21,8 +21,7 @@ Notes
 - `pace` accepts `MM:SS` (per selected unit).
 - `distance` is a float in the selected unit.
 """
-from typing import Optional
-from enum import Enum
+from typing import Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
@@ -43,11 +42,18 @@ from app.utils.durations import (
 router = APIRouter(tags=["Pace Calculator"])  # path preserved as /pace-calc below
 
 
-class UnitEnum(str, Enum):
-    """Supported distance/pace units."""
+# Supported distance/pace units. A Literal validates as a plain string
+# membership check in pydantic-core (no Enum lookup per request).
+Unit = Literal["mi", "km"]
 
-    miles = "mi"
-    km = "km"
+
+# Solver per set of provided inputs, keyed by bitmask (distance=1, time=2, pace=4).
+# Each takes and returns the (distance, time_seconds, pace_seconds_per_unit) trio.
+_SOLVERS = {
+    0b011: lambda d, t, p: (d, t, pace_from_distance_time(d, t)),
+    0b110: lambda d, t, p: (distance_from_time_pace(t, p), t, p),
+    0b101: lambda d, t, p: (d, time_from_distance_pace(d, p), p),
+}
 
 
 class PaceCalcResponse(BaseModel):
@@ -58,7 +64,7 @@ class PaceCalcResponse(BaseModel):
     )
     time: str | None = Field(None, description="Elapsed time formatted as HH:MM:SS")
     pace: str | None = Field(None, description="Pace formatted as MM:SS per selected unit")
-    unit: UnitEnum = Field(description="Unit of distance and corresponding pace")
+    unit: Unit = Field(description="Unit of distance and corresponding pace")
 
 
 @router.get(
@@ -113,8 +119,8 @@ def pace_calc(
         description="Pace as MM:SS (per selected unit)",
         examples={"eight_flat": {"summary": "8 min per mi/km", "value": "08:00"}},
     ),
-    unit: UnitEnum = Query(
-        UnitEnum.miles,
+    unit: Unit = Query(
+        "mi",
         description="Unit of distance ('mi' for miles, 'km' for kilometers)",
         examples={"miles": {"summary": "Miles", "value": "mi"}, "km": {"summary": "Kilometers", "value": "km"}},
     ),
@@ -160,27 +166,17 @@ def pace_calc(
     else:
         pace_seconds_per_unit = None
 
-    # Validate exactly two provided
-    provided = sum(x is not None for x in (distance, time_seconds, pace_seconds_per_unit))
-    if provided != 2:
+    # Validate exactly two provided, then compute the missing third (unit-agnostic math)
+    mask = (distance is not None) | ((time_seconds is not None) << 1) | ((pace_seconds_per_unit is not None) << 2)
+    solve = _SOLVERS.get(mask)
+    if solve is None:
         raise HTTPException(status_code=400, detail="Provide exactly two of distance, time, pace")
-
-    # Compute the missing third (unit-agnostic math)
-    if distance is not None and time_seconds is not None:
-        pace_seconds_per_unit = pace_from_distance_time(distance, time_seconds)
-    elif time_seconds is not None and pace_seconds_per_unit is not None:
-        distance = distance_from_time_pace(time_seconds, pace_seconds_per_unit)
-    elif distance is not None and pace_seconds_per_unit is not None:
-        time_seconds = time_from_distance_pace(distance, pace_seconds_per_unit)
+    distance, time_seconds, pace_seconds_per_unit = solve(distance, time_seconds, pace_seconds_per_unit)
 
     # Build response (format for humans)
     return PaceCalcResponse(
         unit=unit,
         distance=round(distance, 2) if distance is not None else None,
         time=format_time_hhmmss(time_seconds) if time_seconds is not None else None,
-        pace=(
-            format_pace_mmss(int(round(pace_seconds_per_unit)))
-            if pace_seconds_per_unit is not None
-            else None
-        ),
+        pace=format_pace_mmss(pace_seconds_per_unit) if pace_seconds_per_unit is not None else None,
     )
\ No newline at end of file
@@ -16,25 +16,36 @@ Highlights
 NOTE: The in-memory `DB` is a placeholder. It resets on process restart.
 """
 
-from datetime import datetime
-from typing import Optional, List
+import asyncio
+from typing import Annotated, Optional, List, Tuple
 
 from fastapi import APIRouter, HTTPException, Response
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import httpx
-from dateutil import parser as dateparser
+import orjson
 from fastapi import Body
 from app.api import strava as strava_api
 from app.models.runs import Run as RunModel, RunCreate, RunTypeEnum, UnitEnum
-from app.services.runs import RunsService
-from fastapi import Depends, Request
+from app.services.runs import DuplicateSourceError, RunsService
+from fastapi import Depends, Path, Query, Request
+
+# Run ids are positive SQLite rowids; reject anything else before touching the DB
+RunId = Annotated[int, Path(ge=1, description="Server-generated run id")]
 
 # Router metadata
 router = APIRouter(prefix="/runs", tags=["Runs"])  # preserve path for compatibility
 def get_runs_service(request: Request) -> RunsService:
     return request.app.state.runs_service
 
-M_PER_MI = 1609.344
+# Max concurrent Strava fetches per batch import
+_BATCH_CONCURRENCY = 8
+
+# A (source, source_ref) pair identifies one imported activity, so it is unique
+_SOURCE_CONFLICT_DETAIL = "Another run already has this source and source_ref"
+_SOURCE_CONFLICT = {
+    "description": "Another run already has this source/source_ref",
+    "content": {"application/json": {"example": {"detail": _SOURCE_CONFLICT_DETAIL}}},
+}
 
 
 class CreateRunFromStravaIn(BaseModel):
@@ -49,13 +60,29 @@ class CreateRunFromStravaIn(BaseModel):
     unit: UnitEnum = Field(UnitEnum.mi, description="Unit for distance")
     run_type: RunTypeEnum = Field(RunTypeEnum.easy, description="Categorization of the run")
 
-    model_config = {
-        "json_schema_extra": {
+    # Forbid extras: unknown keys are a client bug, and pydantic-core can use
+    # its tighter no-extras validator.
+    model_config = ConfigDict(
+        extra="forbid",
+        json_schema_extra={
             "examples": [
                 {"activity_id": 1234567890, "title": "Track workout", "run_type": "Workout"}
             ]
-        }
-    }
+        },
+    )
+
+
+class CreateRunsFromStravaIn(BaseModel):
+    """Import several Strava activities in one request."""
+    activity_ids: List[int] = Field(..., min_length=1, max_length=200, description="Strava activity ids to import")
+    athlete_id: Optional[int] = Field(None, description="Strava athlete id (optional in dev)")
+    unit: UnitEnum = Field(UnitEnum.mi, description="Unit for distance")
+    run_type: RunTypeEnum = Field(RunTypeEnum.easy, description="Categorization of the runs")
+
+    model_config = ConfigDict(
+        extra="forbid",
+        json_schema_extra={"examples": [{"activity_ids": [1234567890, 1234567891]}]},
+    )
 
 
 # ---- CRUD ----
@@ -65,9 +92,13 @@ class CreateRunFromStravaIn(BaseModel):
     status_code=201,
     summary="Create a run",
     response_description="The created run including its generated `id`.",
+    responses={409: _SOURCE_CONFLICT},
 )
 def create_run(run: RunCreate, svc: RunsService = Depends(get_runs_service)) -> RunModel:
-    return svc.create(run)
+    obj, created = svc.create_or_get(run)
+    if not created:
+        raise HTTPException(status_code=409, detail=_SOURCE_CONFLICT_DETAIL)
+    return obj
 
 
 @router.get(
@@ -76,8 +107,16 @@ def create_run(run: RunCreate, svc: RunsService = Depends(get_runs_service)) ->
     summary="List runs",
     response_description="An array of stored runs (order is unspecified).",
 )
-def list_runs(svc: RunsService = Depends(get_runs_service)) -> List[RunModel]:
-    return svc.list_runs()
+def list_runs(
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Max runs to return (default: all)"),
+    offset: int = Query(0, ge=0, description="Runs to skip, for pagination"),
+    svc: RunsService = Depends(get_runs_service),
+) -> Response:
+    # Read-only listing: rows go straight from SQLite to JSON bytes, skipping
+    # model hydration. `RunDict` mirrors `RunModel`'s serialized shape, and
+    # `response_model` still documents it.
+    rows = svc.list_runs_raw(limit=limit, offset=offset)
+    return Response(orjson.dumps(rows), media_type="application/json")
 
 
 @router.get(
@@ -91,7 +130,7 @@ def list_runs(svc: RunsService = Depends(get_runs_service)) -> List[RunModel]:
         }
     },
 )
-def get_run(run_id: int, svc: RunsService = Depends(get_runs_service)) -> RunModel:
+def get_run(run_id: RunId, svc: RunsService = Depends(get_runs_service)) -> RunModel:
     obj = svc.get(run_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Run not found")
@@ -106,24 +145,59 @@ def get_run(run_id: int, svc: RunsService = Depends(get_runs_service)) -> RunMod
         404: {
             "description": "Run not found",
             "content": {"application/json": {"example": {"detail": "Run not found"}}},
-        }
+        },
+        409: _SOURCE_CONFLICT,
     },
 )
-def update_run(run_id: int, run: RunCreate, svc: RunsService = Depends(get_runs_service)) -> RunModel:
-    obj = svc.update(run_id, run)
+def update_run(run_id: RunId, run: RunCreate, svc: RunsService = Depends(get_runs_service)) -> RunModel:
+    try:
+        obj = svc.update(run_id, run)
+    except DuplicateSourceError:
+        raise HTTPException(status_code=409, detail=_SOURCE_CONFLICT_DETAIL)
     if not obj:
         raise HTTPException(status_code=404, detail="Run not found")
     return obj
 
 
+async def _import_strava_activity(
+    svc: RunsService,
+    client: httpx.AsyncClient,
+    activity_id: int,
+    athlete_id: Optional[int],
+    unit: UnitEnum,
+    run_type: RunTypeEnum,
+    title: Optional[str] = None,
+) -> Tuple[RunModel, bool]:
+    """Fetch one Strava activity and store it as a run.
+
+    Returns ``(run, created)``; ``created`` is False when the activity had
+    already been imported and the stored run is returned instead. That
+    includes an import that finished while this one was fetching.
+    """
+    existing = svc.get_by_source("strava", str(activity_id))
+    if existing:
+        return existing, False
+
+    # Resolve the athlete (auto-resolve allowed in dev)
+    athlete_id = strava_api._resolve_athlete_id(athlete_id)
+    run_in = await strava_api.fetch_strava_run(client, activity_id, athlete_id, unit, run_type, title)
+    return svc.create_or_get(run_in)
+
+
 @router.post(
     "/from-strava",
     response_model=RunModel,
     status_code=201,
     summary="Create a run from a Strava activity",
     response_description="The created run imported from Strava.",
+    responses={200: {"model": RunModel, "description": "Activity already imported; the existing run is returned."}},
 )
-async def create_run_from_strava(payload: CreateRunFromStravaIn = Body(...), svc: RunsService = Depends(get_runs_service)) -> RunModel:
+async def create_run_from_strava(
+    response: Response,
+    payload: CreateRunFromStravaIn = Body(...),
+    svc: RunsService = Depends(get_runs_service),
+    client: httpx.AsyncClient = Depends(strava_api.get_http_client),
+) -> RunModel:
     """Import a Strava activity and store it as a run.
 
     This calls Strava's activity detail endpoint using the connected athlete's
@@ -131,59 +205,73 @@ async def create_run_from_strava(payload: CreateRunFromStravaIn = Body(...), svc
     We purposefully **do not** call our public `/strava/activities/{id}/preview`
     endpoint here to avoid an internal HTTP roundtrip and keep the server as
     source-of-truth.
-    """
-    # Resolve token for the athlete (auto-resolve allowed in dev)
-    athlete_id = payload.athlete_id
-    token = await strava_api._ensure_token(athlete_id if athlete_id is not None else strava_api._resolve_athlete_id(None))
-
-    headers = {"Authorization": f"Bearer {token}"}
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get(f"https://www.strava.com/api/v3/activities/{payload.activity_id}", headers=headers, params={"include_all_efforts": "false"})
-    if r.status_code != 200:
-        try:
-            detail = r.json()
-        except Exception:
-            detail = r.text
-        raise HTTPException(status_code=502, detail={"reason": "strava_activity_fetch_failed", "upstream": detail})
 
-    act = r.json()
+    Re-importing an activity that is already stored returns the existing run
+    (200) without calling Strava.
+    """
+    run, created = await _import_strava_activity(
+        svc, client, payload.activity_id, payload.athlete_id, payload.unit, payload.run_type, payload.title
+    )
+    if not created:
+        response.status_code = 200
+    return run
 
-    # Map fields
-    distance_m = act.get("distance") or 0
-    moving_time_s = act.get("moving_time") or 0
-    name = payload.title or act.get("name") or "Strava Run"
-    description = act.get("description") or ""
 
-    # Parse local start time if available, fallback to UTC start_date
-    start_iso = act.get("start_date_local") or act.get("start_date")
-    try:
-        started_at = dateparser.parse(start_iso) if start_iso else datetime.utcnow()
-    except Exception:
-        started_at = datetime.utcnow()
-
-    # Unit conversion
-    if payload.unit == "mi":
-        distance = round(distance_m / M_PER_MI, 3)
-    else:  # km
-        distance = round(distance_m / 1000.0, 3)
-
-    # Elevation in feet if available
-    elev_ft = (act.get("total_elevation_gain") or 0) * 3.28084
-
-    run_in = RunCreate(
-        title=name,
-        description=description,
-        started_at=started_at,
-        distance=distance,
-        unit=payload.unit,
-        duration_s=int(moving_time_s),
-        run_type=payload.run_type,
-        elevation_ft=elev_ft,
-        source="strava",
-        source_ref=str(payload.activity_id),
-    )
-    created = svc.create(run_in)
-    return created
+@router.post(
+    "/from-strava/batch",
+    response_model=List[RunModel],
+    status_code=201,
+    summary="Create runs from several Strava activities",
+    response_description="The imported (or already stored) runs, in request order.",
+    responses={200: {"model": List[RunModel], "description": "Every activity was already imported; nothing was created."}},
+)
+async def create_runs_from_strava(
+    response: Response,
+    payload: CreateRunsFromStravaIn = Body(...),
+    svc: RunsService = Depends(get_runs_service),
+    client: httpx.AsyncClient = Depends(strava_api.get_http_client),
+) -> List[RunModel]:
+    """Import several Strava activities concurrently over the shared client.
+
+    Already-imported activities are returned as stored. The rest are fetched
+    with one shared access token, overlapping up to `_BATCH_CONCURRENCY`
+    requests (so N activities cost roughly N / concurrency round-trips
+    instead of N), then inserted in a single transaction. If any fetch
+    fails its error is returned and nothing new is stored. Responds 200
+    instead of 201 when no new run was created.
+    """
+    # dict.fromkeys: drop duplicate ids, keeping order
+    ids = list(dict.fromkeys(payload.activity_ids))
+    runs = {a: svc.get_by_source("strava", str(a)) for a in ids}
+    missing = [a for a, run in runs.items() if run is None]
+    created = False
+    if missing:
+        # One token for the whole batch, so concurrent fetches don't each refresh it
+        athlete_id = strava_api._resolve_athlete_id(payload.athlete_id)
+        token = await strava_api._ensure_token(client, athlete_id)
+        sem = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+        async def _one(activity_id: int) -> RunCreate:
+            async with sem:
+                return await strava_api.fetch_strava_run(
+                    client, activity_id, athlete_id, payload.unit, payload.run_type, token=token
+                )
+
+        tasks = [asyncio.create_task(_one(a)) for a in missing]
+        try:
+            new_runs = await asyncio.gather(*tasks)
+        except BaseException:
+            # The request has failed: stop the sibling fetches rather than
+            # spending rate limit (and cache) on runs that won't be stored
+            for task in tasks:
+                task.cancel()
+            raise
+        results = svc.create_or_get_many(list(new_runs))
+        runs.update((a, run) for a, (run, _) in zip(missing, results))
+        created = any(c for _, c in results)
+    if not created:
+        response.status_code = 200
+    return [runs[a] for a in ids]
 
 
 @router.delete(
@@ -199,9 +287,8 @@ async def create_run_from_strava(payload: CreateRunFromStravaIn = Body(...), svc
         },
     },
 )
-def delete_run(run_id: int, svc: RunsService = Depends(get_runs_service)) -> Response:
+def delete_run(run_id: RunId, svc: RunsService = Depends(get_runs_service)) -> Response:
     """Delete a run. Returns 204 No Content on success."""
-    if not svc.get(run_id):
+    if not svc.delete(run_id):
         raise HTTPException(status_code=404, detail="Run not found")
-    svc.delete(run_id)
     return Response(status_code=204)
@@ -22,10 +22,10 @@ GET  /api/strava/activities?athlete_id=...&page=1&per_page=30&after=YYYY-MM-DD
     Lists recent activities (proxied from Strava) with a trimmed set of fields
     suitable for a picker UI (id, name, date, distance, moving_time, type).
 
-GET  /api/strava/activities/{id}/preview?athlete_id=...
+GET  /api/strava/activities/{id}/preview?athlete_id=...&full=false
     Fetches activity detail + streams and returns a normalized preview JSON
     (summary, polyline, downsampled series, mile splits) compatible with the
-    GPX preview UI.
+    GPX preview UI. `full=true` skips downsampling.
 
 Notes
 -----
@@ -35,25 +35,46 @@ Notes
   if you truly need private activities.
 - We request streams keys: `latlng,time,velocity_smooth,heartrate,altitude`.
   These map cleanly to your UI's series (pace/hr/elev) and a route polyline.
+- `fetch_strava_run` maps an activity to a `RunCreate`; it backs both the
+  runs router's `/runs/from-strava` imports and the bulk sync here.
 """
 
+import hashlib
 import os
 import time
-import uuid
 import asyncio
-from datetime import datetime
-from typing import Any, Dict, Optional, List
+from secrets import token_hex
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import pairwise
+from typing import Any, Dict, Optional, List, Set, Tuple
 
 import httpx
-from fastapi import APIRouter, HTTPException, Request, Query, Body
-from fastapi.responses import RedirectResponse, JSONResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, Body
+from fastapi.responses import RedirectResponse, JSONResponse, Response
+from pydantic import BaseModel, ValidationError
+from app.models.runs import RunCreate, RunTypeEnum, UnitEnum
 from app.settings import settings
+from app.utils.cache import TTLCache
 
 router = APIRouter(prefix="/api/strava", tags=["strava"])
 
 # --- Units ---
 M_PER_MI = 1609.344
 FT_PER_M = 3.28084
+# Meters -> miles as a multiply; pace (M_PER_MI / speed) still divides per sample
+_INV_M_PER_MI = 1.0 / M_PER_MI
+# Meters -> selected unit, as a multiply (avoids a branch per import)
+_UNIT_SCALE = {UnitEnum.mi: _INV_M_PER_MI, UnitEnum.km: 1e-3}
+
+# Max samples per series returned by the activity preview (unless full=true)
+_PREVIEW_MAX_POINTS = 1500
+
+# Encoded preview/route bodies keyed by (view, athlete_id, activity_id, ...),
+# so repeat opens of the import picker skip Strava entirely.
+_ACTIVITY_VIEW_CACHE: TTLCache[bytes] = TTLCache(ttl=600, maxsize=256)
+_ACTIVITY_VIEW_VERSION = "v1"
 
 # --- Config helpers ---
 CLIENT_ID = settings.STRAVA_CLIENT_ID or os.getenv("STRAVA_CLIENT_ID")
@@ -70,15 +91,81 @@ SCOPES = ["read", "activity:read"]
 #   Fields: strava_athlete_id, access_token, refresh_token, expires_at
 _TOKEN_STORE: Dict[int, Dict[str, Any]] = {}
 
-# Short‑lived OAuth state store (dev helper in case cookies don't round‑trip)
-_OAUTH_STATES: set[str] = set()
+# Refresh tokens this long (seconds) before they expire, so a token is never
+# used in the last minutes of its life.
+_TOKEN_EXPIRY_BUFFER_S = 300
+# One lock per athlete so concurrent requests share a single token refresh
+_REFRESH_LOCKS: Dict[int, asyncio.Lock] = {}
+
+# Max concurrent imports during a bulk sync
+_SYNC_CONCURRENCY = 10
+# Activity list pages fetched concurrently during a bulk sync
+_SYNC_PAGE_WINDOW = 4
+
+# Short‑lived OAuth state store (dev helper in case cookies don't round‑trip).
+# Entries expire with the state cookie, so abandoned flows don't accumulate.
+_OAUTH_STATES: TTLCache[bool] = TTLCache(ttl=600, maxsize=10_000)
+
+# --- Shared HTTP client ---
+STRAVA_BASE_URL = "https://www.strava.com"
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build the pooled Strava client. Created once per app lifespan so
+    keep‑alive connections (and their TLS sessions) are reused across calls."""
+    return httpx.AsyncClient(
+        base_url=STRAVA_BASE_URL,
+        timeout=httpx.Timeout(20.0),
+        # httpx drops idle connections after 5s by default; bulk sync and the
+        # import picker hit Strava in bursts, so keep sockets warm for 30s to
+        # avoid repeating the TLS handshake between calls.
+        limits=httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30.0),
+        headers={"User-Agent": "chsn/1.0"},
+    )
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """FastAPI dependency returning the app‑scoped Strava client."""
+    return request.app.state.strava_client
+
+
+class _OrjsonResponse(JSONResponse):
+    """JSONResponse encoded with orjson, which is much faster on the long
+    float series in previews and routes."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def _activity_cache_headers(key: Tuple[Any, ...]) -> Dict[str, str]:
+    """ETag + Cache-Control for an activity view (preview/route).
+
+    A finished activity's streams don't change, so the ETag is derived from
+    the request key alone (bump the version tag when the payload shape
+    changes) and browsers may reuse the response for a day.
+    """
+    digest = hashlib.sha1(":".join(map(str, (*key, _ACTIVITY_VIEW_VERSION))).encode()).hexdigest()
+    return {"ETag": f'"{digest}"', "Cache-Control": "private, max-age=86400"}
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match lists `etag` (or is `*`)."""
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    return any(tag.strip() in (etag, "*") for tag in inm.split(","))
+
+
+def _climb_m(altitude: List[Optional[float]]) -> float:
+    """Total ascent (meters) of an altitude stream: the sum of its rises."""
+    return sum(b - a for a, b in pairwise(altitude) if a is not None and b is not None and b > a)
 
 
 def _resolve_athlete_id(maybe_id: Optional[int]) -> int:
     """If an athlete_id is provided, return it; otherwise, if exactly one
     athlete is connected (dev flow), return that one. Otherwise error."""
     if maybe_id is not None:
-        return int(maybe_id)
+        return maybe_id
     if len(_TOKEN_STORE) == 1:
         return next(iter(_TOKEN_STORE.keys()))
     raise HTTPException(status_code=400, detail="athlete_id is required")
@@ -94,18 +181,18 @@ async def connect(request: Request) -> RedirectResponse:
     if not CLIENT_ID or not CLIENT_SECRET:
         raise HTTPException(status_code=500, detail="Missing STRAVA_CLIENT_ID/SECRET env vars")
 
-    state = uuid.uuid4().hex
+    state = token_hex(16)
     scope = ",".join(SCOPES)
 
     # Build callback URL from the incoming request to avoid localhost/127.0.0.1 mismatches
     base_from_req = f"{request.url.scheme}://{request.url.netloc}"
     callback_url = f"{base_from_req}{CALLBACK_PATH}"
 
-    # Track state in memory as a fallback (cleared on callback)
-    _OAUTH_STATES.add(state)
+    # Track state in memory as a fallback (cleared on callback, expires with the cookie)
+    _OAUTH_STATES.set(state, True)
 
     auth_url = (
-        "https://www.strava.com/oauth/authorize"
+        f"{STRAVA_BASE_URL}/oauth/authorize"
         f"?client_id={CLIENT_ID}"
         f"&redirect_uri={callback_url}"
         "&response_type=code"
@@ -128,7 +215,12 @@ async def connect(request: Request) -> RedirectResponse:
 # ========== Lightweight Route for Map Rendering ==========
 
 @router.get("/activities/{activity_id}/route")
-async def activity_route(athlete_id: Optional[int] = None, activity_id: int = 0):
+async def activity_route(
+    request: Request,
+    athlete_id: Optional[int] = None,
+    activity_id: int = 0,
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
     """Return only the GPS route for an activity (small payload for map rendering).
 
     Response shape:
@@ -136,41 +228,60 @@ async def activity_route(athlete_id: Optional[int] = None, activity_id: int = 0)
       "polyline": [[lat, lng], ...],
       "bounds": {"min_lat": .., "min_lng": .., "max_lat": .., "max_lng": ..}
     }
+
+    Cacheable: see `_activity_cache_headers`.
     """
     athlete_id = _resolve_athlete_id(athlete_id)
-    token = await _ensure_token(athlete_id)
+    key = ("route", athlete_id, activity_id)
+    cache_headers = _activity_cache_headers(key)
+    if _etag_matches(request, cache_headers["ETag"]):
+        return Response(status_code=304, headers=cache_headers)
+    body = _ACTIVITY_VIEW_CACHE.get(key)
+    if body is not None:
+        return Response(body, media_type="application/json", headers=cache_headers)
+
+    token = await _ensure_token(client, athlete_id)
     headers = {"Authorization": f"Bearer {token}"}
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        streams_r = await client.get(
-            f"https://www.strava.com/api/v3/activities/{activity_id}/streams",
-            headers=headers,
-            params={
-                "keys": "latlng",
-                "key_by_type": "true",
-            },
-        )
+    streams_r = await client.get(
+        f"/api/v3/activities/{activity_id}/streams",
+        headers=headers,
+        params={
+            "keys": "latlng",
+            "key_by_type": "true",
+        },
+    )
 
     if streams_r.status_code != 200:
         raise HTTPException(status_code=502, detail={"reason": "route_failed", "streams_status": streams_r.status_code})
 
-    streams = streams_r.json() or {}
+    streams = orjson.loads(streams_r.content) or {}
     latlng = streams.get("latlng", {}).get("data", [])
 
-    # Compute simple bounds for convenience
+    # Compute simple bounds for convenience (one pass, no per-axis lists)
     if latlng:
-        lats = [p[0] for p in latlng]
-        lngs = [p[1] for p in latlng]
+        min_lat, min_lng = max_lat, max_lng = latlng[0]
+        for lat, lng in latlng:
+            if lat < min_lat:
+                min_lat = lat
+            elif lat > max_lat:
+                max_lat = lat
+            if lng < min_lng:
+                min_lng = lng
+            elif lng > max_lng:
+                max_lng = lng
         bounds = {
-            "min_lat": min(lats),
-            "min_lng": min(lngs),
-            "max_lat": max(lats),
-            "max_lng": max(lngs),
+            "min_lat": min_lat,
+            "min_lng": min_lng,
+            "max_lat": max_lat,
+            "max_lng": max_lng,
         }
     else:
         bounds = None
 
-    return JSONResponse({"polyline": latlng, "bounds": bounds})
+    body = orjson.dumps({"polyline": latlng, "bounds": bounds})
+    _ACTIVITY_VIEW_CACHE.set(key, body)
+    return Response(body, media_type="application/json", headers=cache_headers)
 
 
 @router.get("/oauth/callback")
@@ -180,6 +291,7 @@ async def oauth_callback(
     scope: Optional[str] = None,
     state: Optional[str] = None,
     error: Optional[str] = None,
+    client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """Handle Strava OAuth callback: exchange `code` for tokens and store them.
 
@@ -192,12 +304,11 @@ async def oauth_callback(
 
     # CSRF state check
     cookie_state = request.cookies.get("strava_oauth_state")
-    valid = (cookie_state and state and cookie_state == state) or (state in _OAUTH_STATES)
+    # one‑time use: consume the server-side state whichever check passes
+    known_state = bool(state) and _OAUTH_STATES.pop(state) is not None
+    valid = (cookie_state and state and cookie_state == state) or known_state
     if not valid:
         raise HTTPException(status_code=400, detail="Invalid or missing OAuth state")
-    # one‑time use
-    if state:
-        _OAUTH_STATES.discard(state)
 
     data = {
         "client_id": CLIENT_ID,
@@ -206,16 +317,15 @@ async def oauth_callback(
         "grant_type": "authorization_code",
     }
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.post("https://www.strava.com/api/v3/oauth/token", data=data)
-        if r.status_code != 200:
-            # Forward a readable error to the client
-            try:
-                detail = r.json()
-            except Exception:
-                detail = r.text
-            raise HTTPException(status_code=502, detail={"reason": "token_exchange_failed", "upstream": detail})
-        token = r.json()
+    r = await client.post("/api/v3/oauth/token", data=data)
+    if r.status_code != 200:
+        # Forward a readable error to the client
+        try:
+            detail = r.json()
+        except Exception:
+            detail = r.text
+        raise HTTPException(status_code=502, detail={"reason": "token_exchange_failed", "upstream": detail})
+    token = orjson.loads(r.content)
 
     access_token = token.get("access_token")
     refresh_token = token.get("refresh_token")
@@ -238,36 +348,42 @@ async def oauth_callback(
     redirect_to = "/static/index.html?view=training-log&strava=connected"
     resp = RedirectResponse(url=redirect_to, status_code=302)
     resp.delete_cookie("strava_oauth_state")
-    _OAUTH_STATES.discard(state or "")
     return resp
 
 
-async def _ensure_token(athlete_id: int) -> str:
-    """Get a valid access token for the athlete, refreshing if needed."""
-    rec = _TOKEN_STORE.get(int(athlete_id))
+async def _ensure_token(client: httpx.AsyncClient, athlete_id: int) -> str:
+    """Get a valid access token for the athlete, refreshing it with `client` if needed."""
+    rec = _TOKEN_STORE.get(athlete_id)
     if not rec:
         raise HTTPException(status_code=401, detail="No Strava token on file for this athlete")
 
-    now = int(time.time())
-    if rec["expires_at"] - now > 60:  # still valid with 1‑min buffer
+    if rec["expires_at"] - int(time.time()) > _TOKEN_EXPIRY_BUFFER_S:
         return rec["access_token"]
 
-    # Refresh
+    # Single-flight refresh: concurrent callers (e.g. a batch import) wait for
+    # the first refresh instead of each POSTing to /oauth/token.
+    async with _REFRESH_LOCKS.setdefault(athlete_id, asyncio.Lock()):
+        if rec["expires_at"] - int(time.time()) > _TOKEN_EXPIRY_BUFFER_S:
+            return rec["access_token"]
+        return await _refresh_token(client, rec)
+
+
+async def _refresh_token(client: httpx.AsyncClient, rec: Dict[str, Any]) -> str:
+    """Exchange the record's refresh token for a new access token and store it."""
     payload = {
         "client_id": CLIENT_ID,
         "client_secret": CLIENT_SECRET,
         "grant_type": "refresh_token",
         "refresh_token": rec["refresh_token"],
     }
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.post("https://www.strava.com/api/v3/oauth/token", data=payload)
-        if r.status_code != 200:
-            try:
-                detail = r.json()
-            except Exception:
-                detail = r.text
-            raise HTTPException(status_code=502, detail={"reason": "token_refresh_failed", "upstream": detail})
-        token = r.json()
+    r = await client.post("/api/v3/oauth/token", data=payload)
+    if r.status_code != 200:
+        try:
+            detail = r.json()
+        except Exception:
+            detail = r.text
+        raise HTTPException(status_code=502, detail={"reason": "token_refresh_failed", "upstream": detail})
+    token = orjson.loads(r.content)
 
     rec.update(
         {
@@ -279,19 +395,110 @@ async def _ensure_token(athlete_id: int) -> str:
     return rec["access_token"]
 
 
+# ========== Activity -> Run mapping ==========
+class StravaActivity(BaseModel):
+    """The subset of Strava's DetailedActivity used when importing a run.
+
+    Parsed straight from the response bytes with `model_validate_json`, so
+    JSON decoding and ISO 8601 datetime parsing happen in one pydantic-core pass.
+    The rest of the payload is ignored (pydantic's default for extra keys).
+    """
+    name: Optional[str] = None
+    description: Optional[str] = None
+    distance: Optional[float] = None
+    moving_time: Optional[int] = None
+    total_elevation_gain: Optional[float] = None
+    start_date_local: Optional[datetime] = None
+    start_date: Optional[datetime] = None
+
+
+# Strava activities keyed by (athlete_id, activity_id). Activities are
+# effectively immutable for minutes, so retries/double-submits skip the fetch
+# and don't spend Strava's 15-minute rate-limit budget. Bounded in size.
+_ACTIVITY_CACHE: TTLCache[StravaActivity] = TTLCache(ttl=300, maxsize=1024)
+
+
+async def fetch_strava_run(
+    client: httpx.AsyncClient,
+    activity_id: int,
+    athlete_id: int,
+    unit: UnitEnum,
+    run_type: RunTypeEnum,
+    title: Optional[str] = None,
+    token: Optional[str] = None,
+) -> RunCreate:
+    """Fetch one Strava activity and map it to a `RunCreate` (not stored).
+
+    Pass `token` to reuse an access token already obtained for `athlete_id`;
+    otherwise one is only requested on an activity cache miss.
+    """
+    cache_key = (athlete_id, activity_id)
+    act = _ACTIVITY_CACHE.get(cache_key)
+    if act is None:
+        if token is None:
+            token = await _ensure_token(client, athlete_id)
+        headers = {"Authorization": f"Bearer {token}"}
+        r = await client.get(f"/api/v3/activities/{activity_id}", headers=headers, params={"include_all_efforts": "false"})
+        if r.status_code != 200:
+            try:
+                detail = r.json()
+            except Exception:
+                detail = r.text
+            raise HTTPException(status_code=502, detail={"reason": "strava_activity_fetch_failed", "upstream": detail})
+        try:
+            act = StravaActivity.model_validate_json(r.content)
+        except ValidationError:
+            raise HTTPException(status_code=502, detail={"reason": "strava_activity_invalid", "upstream": r.text})
+        _ACTIVITY_CACHE.set(cache_key, act)
+
+    # Map fields
+    distance_m = act.distance or 0
+    moving_time_s = act.moving_time or 0
+    name = title or act.name or "Strava Run"
+    description = act.description or ""
+
+    # Prefer local start time if available, fallback to UTC start_date
+    started_at = act.start_date_local or act.start_date or datetime.now(timezone.utc)
+
+    # Unit conversion
+    distance = round(distance_m * _UNIT_SCALE[unit], 3)
+
+    # Elevation in feet if available
+    elev_ft = (act.total_elevation_gain or 0) * FT_PER_M
+
+    # Values below are computed here with the right types, so skip validation
+    # and enforce the RunCreate constraints (distance > 0, duration >= 1,
+    # title <= 120 chars) explicitly.
+    if distance <= 0 or int(moving_time_s) < 1:
+        raise HTTPException(status_code=400, detail="Strava activity has no distance or moving time")
+    run_in = RunCreate.model_construct(
+        title=name[:120],
+        description=description,
+        started_at=started_at,
+        distance=distance,
+        unit=unit,
+        duration_s=int(moving_time_s),
+        run_type=run_type,
+        elevation_ft=elev_ft,
+        source="strava",
+        source_ref=str(activity_id),
+    )
+    return run_in
+
+
 # ========== Debug ==========
 @router.get("/me")
-async def whoami(athlete_id: Optional[int] = None):
+async def whoami(athlete_id: Optional[int] = None, client: httpx.AsyncClient = Depends(get_http_client)):
     """Simple debug endpoint to verify tokens (dev only).
 
     Call with the athlete_id you just connected; returns Strava athlete profile.
     """
     athlete_id = _resolve_athlete_id(athlete_id)
-    token = await _ensure_token(athlete_id)
+    token = await _ensure_token(client, athlete_id)
     headers = {"Authorization": f"Bearer {token}"}
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get("https://www.strava.com/api/v3/athlete", headers=headers)
-    return JSONResponse(r.json())
+    r = await client.get("/api/v3/athlete", headers=headers)
+    # Pass Strava's body through as-is; no need to decode and re-encode it
+    return Response(content=r.content, media_type="application/json")
 
 
 @router.get("/status")
@@ -305,13 +512,13 @@ async def status(athlete_id: Optional[int] = None):
     except HTTPException as e:
         # Return empty status instead of error to simplify front-end checks
         if e.status_code == 400:
-            return JSONResponse({"connected": False})
+            return _OrjsonResponse({"connected": False})
         raise
     rec = _TOKEN_STORE.get(aid)
     if not rec:
-        return JSONResponse({"connected": False})
+        return _OrjsonResponse({"connected": False})
     athlete = rec.get("athlete", {})
-    return JSONResponse({
+    return _OrjsonResponse({
         "connected": True,
         "athlete_id": aid,
         "athlete": {"firstname": athlete.get("firstname"), "lastname": athlete.get("lastname")},
@@ -327,6 +534,7 @@ async def list_activities(
     per_page: int = Query(30, ge=1, le=200),
     after: Optional[str] = Query(None, description="ISO date, e.g., 2024-01-01"),
     activity_type: str = Query("Run", description="Activity type to filter, default Run"),
+    client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """List recent activities for the connected athlete (trimmed fields).
 
@@ -340,7 +548,7 @@ async def list_activities(
         ISO date; when provided we convert to epoch and pass to Strava `after`.
     """
     athlete_id = _resolve_athlete_id(athlete_id)
-    token = await _ensure_token(athlete_id)
+    token = await _ensure_token(client, athlete_id)
     headers = {"Authorization": f"Bearer {token}"}
     params: Dict[str, Any] = {"page": page, "per_page": per_page}
     if after:
@@ -350,8 +558,7 @@ async def list_activities(
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid 'after' date; use YYYY-MM-DD")
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        r = await client.get("https://www.strava.com/api/v3/athlete/activities", headers=headers, params=params)
+    r = await client.get("/api/v3/athlete/activities", headers=headers, params=params)
     if r.status_code != 200:
         try:
             detail = r.json()
@@ -359,7 +566,7 @@ async def list_activities(
             detail = r.text
         raise HTTPException(status_code=502, detail={"reason": "list_failed", "upstream": detail})
 
-    items = r.json()
+    items = orjson.loads(r.content)
     if activity_type:
         items = [it for it in items if (it.get("type") or "").lower() == activity_type.lower()]
     # Trim for UI list
@@ -369,43 +576,62 @@ async def list_activities(
             "name": it.get("name"),
             "type": it.get("type"),
             "start_date": it.get("start_date_local") or it.get("start_date"),
-            "distance_mi": round((it.get("distance") or 0) / M_PER_MI, 2),
+            "distance_mi": round((it.get("distance") or 0) * _INV_M_PER_MI, 2),
             "moving_time_s": it.get("moving_time"),
         }
         for it in items
     ]
-    return JSONResponse(out)
+    return _OrjsonResponse(out)
 
 
 @router.get("/activities/{activity_id}/preview")
-async def preview_activity(athlete_id: Optional[int] = None, activity_id: int = 0):
+async def preview_activity(
+    request: Request,
+    athlete_id: Optional[int] = None,
+    activity_id: int = 0,
+    full: bool = Query(False, description="Return every stream sample instead of a downsampled series"),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
     """Return a normalized preview for one activity.
 
     We fetch:
       - Activity detail (distance, moving_time, elevation gain, splits)
       - Streams keyed by type (latlng, time, velocity_smooth, heartrate, altitude)
     and map them to your preview JSON used by the GPX importer.
+
+    Series and polyline are downsampled by a fixed stride to at most
+    `_PREVIEW_MAX_POINTS` samples (kept index-aligned); pass `full=true` for
+    every sample. Cacheable: see `_activity_cache_headers`.
     """
     athlete_id = _resolve_athlete_id(athlete_id)
-    token = await _ensure_token(athlete_id)
+    key = ("preview", athlete_id, activity_id, full)
+    cache_headers = _activity_cache_headers(key)
+    if _etag_matches(request, cache_headers["ETag"]):
+        return Response(status_code=304, headers=cache_headers)
+    body = _ACTIVITY_VIEW_CACHE.get(key)
+    if body is not None:
+        return Response(body, media_type="application/json", headers=cache_headers)
+
+    token = await _ensure_token(client, athlete_id)
     headers = {"Authorization": f"Bearer {token}"}
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        detail_r, streams_r = await asyncio.gather(
-            client.get(
-                f"https://www.strava.com/api/v3/activities/{activity_id}",
-                headers=headers,
-                params={"include_all_efforts": "false"},
-            ),
-            client.get(
-                f"https://www.strava.com/api/v3/activities/{activity_id}/streams",
-                headers=headers,
-                params={
-                    "keys": "latlng,time,velocity_smooth,heartrate,altitude",
-                    "key_by_type": "true",
-                },
-            ),
-        )
+    detail_r, streams_r = await asyncio.gather(
+        client.get(
+            f"/api/v3/activities/{activity_id}",
+            headers=headers,
+            params={"include_all_efforts": "false"},
+            timeout=30,
+        ),
+        client.get(
+            f"/api/v3/activities/{activity_id}/streams",
+            headers=headers,
+            params={
+                "keys": "latlng,time,velocity_smooth,heartrate,altitude",
+                "key_by_type": "true",
+            },
+            timeout=30,
+        ),
+    )
 
     if detail_r.status_code != 200 or streams_r.status_code != 200:
         raise HTTPException(
@@ -417,24 +643,32 @@ async def preview_activity(athlete_id: Optional[int] = None, activity_id: int =
             },
         )
 
-    detail = detail_r.json()
-    streams = streams_r.json()  # key_by_type=true shape
+    detail = orjson.loads(detail_r.content)
+    streams = orjson.loads(streams_r.content)  # key_by_type=true shape
 
     # Summary
-    distance_mi = (detail.get("distance") or 0) / M_PER_MI
+    distance_mi = (detail.get("distance") or 0) * _INV_M_PER_MI
     moving_time_s = detail.get("moving_time")
-    elev_gain_ft = (detail.get("total_elevation_gain") or 0) * FT_PER_M
+    gain_m = detail.get("total_elevation_gain")
+    if gain_m is None:
+        # Some activities (e.g. manual uploads) lack the summary; derive it from the stream
+        gain_m = _climb_m(streams.get("altitude", {}).get("data", []))
+    elev_gain_ft = gain_m * FT_PER_M
     avg_hr = detail.get("average_heartrate")
 
-    # Series (downsample on the client later if needed)
+    # Series, downsampled (before conversion) with one stride so samples stay aligned
     t_s = streams.get("time", {}).get("data", [])
-    v = streams.get("velocity_smooth", {}).get("data", [])
-    pace_s_per_mi = [(M_PER_MI / s) if s and s > 0 else None for s in v]
-    hr_bpm = streams.get("heartrate", {}).get("data", [])
-    elev_ft = [(e or 0) * FT_PER_M for e in streams.get("altitude", {}).get("data", [])]
+    stride = 1 if full else max(1, -(-len(t_s) // _PREVIEW_MAX_POINTS))
+    t_s = t_s[::stride]
+    v = streams.get("velocity_smooth", {}).get("data", [])[::stride]
+    # Rounded to 0.1 s/mi and 0.1 ft: charts can't show more, and short
+    # numbers make the JSON far smaller than full-precision floats.
+    pace_s_per_mi = [round(M_PER_MI / s, 1) if s and s > 0 else None for s in v]
+    hr_bpm = streams.get("heartrate", {}).get("data", [])[::stride]  # integer bpm from Strava
+    elev_ft = [round((e or 0) * FT_PER_M, 1) for e in streams.get("altitude", {}).get("data", [])[::stride]]
 
     # Polyline as lat/lon pairs
-    latlng = streams.get("latlng", {}).get("data", [])  # [[lat, lng], ...]
+    latlng = streams.get("latlng", {}).get("data", [])[::stride]  # [[lat, lng], ...]
 
     # Splits (standard miles if available)
     splits = detail.get("splits_standard") or []
@@ -467,7 +701,9 @@ async def preview_activity(athlete_id: Optional[int] = None, activity_id: int =
         "auto_mile_splits": mile_splits,
         "segments": [],  # could map laps/intervals later
     }
-    return JSONResponse(preview)
+    body = orjson.dumps(preview)
+    _ACTIVITY_VIEW_CACHE.set(key, body)
+    return Response(body, media_type="application/json", headers=cache_headers)
 
 
 # ========== Bulk Sync ==========
@@ -478,6 +714,7 @@ async def sync_all_runs(
     after: Optional[str] = Query(None, description="ISO date, only import activities after this date"),
     max_import: int = Query(200, ge=1, le=2000, description="Max number of activities to import"),
     dry_run: bool = Query(False, description="If true, does not create runs; returns what would be imported"),
+    client: httpx.AsyncClient = Depends(get_http_client),
 ):
     """Bulk-sync Strava **Run** activities into CHSN runs.
 
@@ -486,37 +723,24 @@ async def sync_all_runs(
     - Consider an activity already imported if there's an existing run on the same
       local day with distance within 0.02 mi and moving time within 10s.
       (Heuristic until we add a `source_ref` field on runs.)
-    - For items that look new, call `POST /runs/from-strava` (unless `dry_run=true`).
+    - For items that look new, import them as `POST /runs/from-strava` would (unless `dry_run=true`).
 
     Returns summary counts and IDs.
     """
     # Resolve athlete and token
     athlete_id = _resolve_athlete_id(athlete_id)
-    token = await _ensure_token(athlete_id)
+    token = await _ensure_token(client, athlete_id)
 
-    # Base URL for local calls (handles localhost vs 127.0.0.1)
-    base_from_req = f"{request.url.scheme}://{request.url.netloc}"
+    # Call the runs service directly rather than our own HTTP endpoints
+    svc = request.app.state.runs_service
 
     # Load existing runs to avoid duplicates
-    existing_keyset = set()
-    try:
-        async with httpx.AsyncClient(timeout=30) as c:
-            r = await c.get(f"{base_from_req}/runs")
-            r.raise_for_status()
-            existing = r.json()
-            for run in existing:
-                dt = run.get("started_at")
-                if not dt:
-                    continue
-                day = dt.split("T", 1)[0]
-                dist = float(run.get("distance") or 0.0)
-                # round to 0.02 mi buckets (~105 ft)
-                dist_key = round(dist / 0.02) * 0.02
-                dur = int(run.get("duration_s") or 0)
-                dur_key = round(dur / 10) * 10
-                existing_keyset.add((day, dist_key, dur_key))
-    except Exception:
-        existing_keyset = set()
+    # day -> {(distance in 0.02 mi buckets (~105 ft), duration in 10s buckets)};
+    # integer buckets hash cheaply and avoid comparing rounded floats.
+    existing_by_day: Dict[str, Set[Tuple[int, int]]] = defaultdict(set)
+    for run in svc.list_runs():
+        day = run.started_at.date().isoformat()
+        existing_by_day[day].add((round(run.distance / 0.02), round(run.duration_s / 10)))
 
     headers = {"Authorization": f"Bearer {token}"}
 
@@ -542,15 +766,29 @@ async def sync_all_runs(
     remaining = max_import
     page = 1
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        while remaining > 0:
-            params = dict(params_base)
-            params.update({"page": page})
-            resp = await client.get("https://www.strava.com/api/v3/athlete/activities", headers=headers, params=params)
-            if resp.status_code != 200:
-                break
-            items = resp.json() or []
+    async def _fetch_page(n: int) -> List[Dict[str, Any]]:
+        # A dict per page: pages are fetched concurrently, so one shared dict can't be mutated
+        resp = await client.get(
+            "/api/v3/athlete/activities", headers=headers, params={**params_base, "page": n}, timeout=30
+        )
+        if resp.status_code != 200:
+            return []
+        return orjson.loads(resp.content) or []
+
+    # List pages are fetched a few at a time concurrently (sized to what is
+    # still needed) and processed in order; new activities are collected and
+    # imported concurrently afterwards.
+    to_import: List[int] = []
+    exhausted = False
+    while remaining > 0 and not exhausted:
+        window = min(_SYNC_PAGE_WINDOW, -(-remaining // params_base["per_page"]))
+        pages = await asyncio.gather(*(_fetch_page(page + i) for i in range(window)))
+        page += window
+
+        for items in pages:
+            # An empty (or failed) page ends the listing
             if not items:
+                exhausted = True
                 break
 
             for it in items:
@@ -560,40 +798,57 @@ async def sync_all_runs(
                     continue
 
                 day = day_key(it.get("start_date_local") or it.get("start_date"))
-                dist_key = round(((it.get("distance") or 0) / M_PER_MI) / 0.02) * 0.02
-                dur_key = round(int(it.get("moving_time") or 0) / 10) * 10
-                key = (day, dist_key, dur_key)
-                if key in existing_keyset:
+                key = (
+                    round(((it.get("distance") or 0) * _INV_M_PER_MI) / 0.02),
+                    round(int(it.get("moving_time") or 0) / 10),
+                )
+                if key in existing_by_day.get(day, ()):
                     already.append(it.get("id"))
                     continue
 
+                # Claim the key now so a look-alike later in the listing isn't imported twice
+                existing_by_day[day].add(key)
                 if dry_run:
                     skipped.append(it.get("id"))  # would import
-                    remaining -= 1
                 else:
-                    try:
-                        cr = await client.post(
-                            f"{base_from_req}/runs/from-strava",
-                            json={"activity_id": it.get("id")},
-                            headers={"Content-Type": "application/json"},
-                        )
-                        if cr.status_code in (200, 201):
-                            imported.append(it.get("id"))
-                            existing_keyset.add(key)
-                            remaining -= 1
-                        else:
-                            errors.append({
-                                "activity_id": it.get("id"),
-                                "status": cr.status_code,
-                                "detail": cr.text,
-                            })
-                            remaining -= 1
-                    except Exception as e:
-                        errors.append({"activity_id": it.get("id"), "error": str(e)})
-                        remaining -= 1
-            page += 1
-
-    return JSONResponse(
+                    to_import.append(it.get("id"))
+                remaining -= 1
+
+    if to_import:
+        sem = asyncio.Semaphore(_SYNC_CONCURRENCY)
+
+        async def _fetch(activity_id: int) -> Optional[RunCreate]:
+            if svc.get_by_source("strava", str(activity_id)):
+                return None  # imported earlier (heuristic missed it); nothing to store
+            async with sem:
+                return await fetch_strava_run(
+                    client, activity_id, athlete_id, UnitEnum.mi, RunTypeEnum.easy, token=token
+                )
+
+        results = await asyncio.gather(*(_fetch(a) for a in to_import), return_exceptions=True)
+
+        new_ids: List[int] = []
+        new_runs: List[RunCreate] = []
+        for activity_id, res in zip(to_import, results):
+            if isinstance(res, HTTPException):
+                errors.append({
+                    "activity_id": activity_id,
+                    "status": res.status_code,
+                    "detail": res.detail,
+                })
+            elif isinstance(res, BaseException):  # includes CancelledError
+                errors.append({"activity_id": activity_id, "error": str(res) or type(res).__name__})
+            elif res is None:
+                already.append(activity_id)
+            else:
+                new_ids.append(activity_id)
+                new_runs.append(res)
+        # One transaction for every new run; count only rows actually inserted
+        stored = svc.create_or_get_many(new_runs)
+        for activity_id, (_, created) in zip(new_ids, stored):
+            (imported if created else already).append(activity_id)
+
+    return _OrjsonResponse(
         {
             "ok": True,
             "summary": {
@@ -17,6 +17,7 @@ Notes
 """
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
@@ -42,12 +43,13 @@ class HealthResponse(BaseModel):
     status: Literal["ok"]
 
 
+@lru_cache(maxsize=1)
 def _static_dir() -> str:
     """Return the absolute path to the static files directory.
 
     Prefers the Vite build output (``app/web/dist``). Falls back to the legacy
     ``app/web`` directory to keep local development working before the first
-    frontend build runs.
+    frontend build runs. Resolved once per process.
     """
 
     base = Path(__file__).parent / "web"
@@ -61,10 +63,15 @@ def _static_dir() -> str:
 async def _lifespan(app: FastAPI):
     # Initialize shared services
     app.state.runs_service = RunsService()
+    app.state.strava_client = strava_api.create_http_client()
     try:
         yield
     finally:
         # Best-effort close
+        try:
+            await app.state.strava_client.aclose()
+        except Exception:
+            pass
         try:
             app.state.runs_service.close()
         except Exception:
@@ -15,7 +15,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field, PositiveFloat
+from pydantic import BaseModel, ConfigDict, Field, PositiveFloat
 
 
 class UnitEnum(str, Enum):
@@ -83,8 +83,12 @@ class RunCreate(BaseModel):
         default=None, description="Human-friendly pace 'MM:SS' per selected unit"
     )
 
-    model_config = {
-        "json_schema_extra": {
+    # Frozen: instances are never mutated after validation (services build
+    # results with `model_construct`), and unknown keys are dropped.
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        json_schema_extra={
             "examples": [
                 {
                     "title": "Easy neighborhood loop",
@@ -98,8 +102,8 @@ class RunCreate(BaseModel):
                     "pace": "08:39",
                 }
             ]
-        }
-    }
+        },
+    )
 
 
 class Run(RunCreate):
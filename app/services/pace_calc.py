@@ -15,7 +15,9 @@ def pace_from_distance_time(distance: float, total_seconds: int) -> int:
         >>> pace_from_distance_time(5.0, 1500)
         300
     """
-    return int(round(total_seconds / distance))
+    # Half-up via int(): inputs are positive, and this skips round()'s
+    # banker's-rounding path and global lookup.
+    return int(total_seconds / distance + 0.5)
 
 
 def time_from_distance_pace(distance: float, pace_seconds_per_unit: int) -> int:
@@ -33,7 +35,7 @@ def time_from_distance_pace(distance: float, pace_seconds_per_unit: int) -> int:
         >>> time_from_distance_pace(5.0, 300)
         1500
     """
-    return int(round(distance * pace_seconds_per_unit))
+    return int(distance * pace_seconds_per_unit + 0.5)
 
 
 def distance_from_time_pace(total_seconds: int, pace_seconds_per_unit: int) -> float:
@@ -5,16 +5,46 @@ Includes functionality to initialize the database schema, convert time formats,
 and map database rows to Run models.
 """
 from __future__ import annotations
+import logging
 import os
 import sqlite3
 import threading
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, List, Optional, Tuple, TypedDict
 
-from app.models.runs import Run, RunCreate, UnitEnum
+from app.models.runs import Run, RunCreate, RunTypeEnum
+from app.services.pace_calc import pace_from_distance_time
+from app.utils.durations import format_pace_mmss
 
 
+_log = logging.getLogger(__name__)
+
 _DB_PATH = Path("app/data/app.db")
+# Trim the file on startup once this many pages sit unused on the free-list
+_VACUUM_FREE_PAGES = 256
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a connection to the database with the service's PRAGMAs applied.
+
+    Returns:
+        sqlite3.Connection: A new connection to the SQLite database.
+    """
+    # Allow use across threads (FastAPI/Starlette can execute handlers in threadpool)
+    conn = sqlite3.connect(str(_DB_PATH), check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    # Must precede the WAL switch, which writes the header of a new file.
+    # Freed pages go on a free-list that `_ensure_db` trims incrementally.
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+    # WAL + NORMAL: readers don't block on the writer, and a commit appends to
+    # the log without a per-transaction fsync. Trade-off: a power loss (not an
+    # app crash) can drop the last few commits; the database stays consistent.
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")  # sorts/temp indexes stay in RAM
+    conn.execute("PRAGMA mmap_size=134217728;")  # read pages via a 128 MiB mmap
+    conn.execute("PRAGMA cache_size=-20000;")  # ~20 MB page cache (negative = KiB)
+    return conn
 
 
 def _ensure_db() -> sqlite3.Connection:
@@ -24,9 +54,7 @@ def _ensure_db() -> sqlite3.Connection:
         sqlite3.Connection: A connection to the SQLite database.
     """
     _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    # Allow use across threads (FastAPI/Starlette can execute handlers in threadpool)
-    conn = sqlite3.connect(str(_DB_PATH), check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    conn = _connect()
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS runs (
@@ -40,13 +68,46 @@ def _ensure_db() -> sqlite3.Connection:
           elevation_ft REAL,
           source TEXT,
           source_ref TEXT,
-          pace_s INTEGER,
-          pace TEXT
+          pace_s INTEGER
         );
         """
     )
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at DESC);")
+    # `pace` (MM:SS text) is derived from `pace_s` on read; drop the column
+    # from databases created before that (DROP COLUMN needs SQLite 3.35+).
+    if any(col[1] == "pace" for col in conn.execute("PRAGMA table_info(runs);")):
+        conn.execute("ALTER TABLE runs DROP COLUMN pace;")
+    # Matches list_runs' ORDER BY exactly, so the listing is an index walk
+    # with no temp B-tree sort (replaces the started_at-only index).
+    conn.execute("DROP INDEX IF EXISTS idx_runs_started_at;")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_started_at_id ON runs(started_at DESC, id DESC);")
+    # One run per imported activity: UNIQUE, so concurrent imports of the same
+    # activity can't both insert it (replaces the plain source_ref index).
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_runs_source_unique';").fetchone() is None:
+        dups = conn.execute(
+            "SELECT source, source_ref, group_concat(id, ',') FROM runs "
+            "WHERE source IS NOT NULL AND source_ref IS NOT NULL "
+            "GROUP BY source, source_ref HAVING COUNT(*) > 1;"
+        ).fetchall()
+        if dups:
+            # Never delete stored runs during setup: report the duplicates and
+            # keep the plain index until they are resolved (checked each start).
+            _log.warning(
+                "runs: not enforcing one run per (source, source_ref); delete the extra runs and restart. "
+                "Duplicates (run ids): %s",
+                "; ".join(f"{src}/{ref}: {ids}" for src, ref, ids in dups),
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_source_ref ON runs(source, source_ref);")
+        else:
+            conn.execute("DROP INDEX IF EXISTS idx_runs_source_ref;")
+            conn.execute("CREATE UNIQUE INDEX idx_runs_source_unique ON runs(source, source_ref) WHERE source IS NOT NULL;")
     conn.commit()
+    # Keep B-tree pages dense after deletes. Databases created before
+    # auto_vacuum was set need one full VACUUM to switch modes.
+    if conn.execute("PRAGMA auto_vacuum;").fetchone()[0] == 0:
+        conn.execute("VACUUM;")
+    elif conn.execute("PRAGMA freelist_count;").fetchone()[0] > _VACUUM_FREE_PAGES:
+        # executescript steps the pragma to completion (execute frees one page)
+        conn.executescript("PRAGMA incremental_vacuum;")
     return conn
 
 
@@ -61,8 +122,119 @@ def _sec_to_mmss(sec: int) -> str:
     """
     if sec <= 0:
         return "00:00"
-    m, s = divmod(int(round(sec)), 60)
-    return f"{m:02d}:{s:02d}"
+    return format_pace_mmss(sec)
+
+
+# SQL is kept in constants: sqlite3 caches prepared statements by their text,
+# so each query is parsed once per connection rather than per call.
+_SELECT_RUN = (
+    "SELECT id, title, description, started_at, distance, unit, duration_s, elevation_ft, source, source_ref, pace_s "
+    "FROM runs"
+)
+_LIST_SQL = f"{_SELECT_RUN} ORDER BY started_at DESC, id DESC LIMIT ? OFFSET ?"
+_GET_SQL = f"{_SELECT_RUN} WHERE id = ?"
+_GET_BY_SOURCE_SQL = f"{_SELECT_RUN} WHERE source = ? AND source_ref = ? ORDER BY id LIMIT 1"
+
+_INSERT_SQL = """
+INSERT INTO runs (title, description, started_at, distance, unit, duration_s, elevation_ft, source, source_ref, pace_s)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT DO NOTHING
+RETURNING id
+"""
+
+# RETURNING tells us whether the row existed, so no SELECT beforehand
+_UPDATE_SQL = """
+UPDATE runs
+SET title = ?, description = ?, started_at = ?, distance = ?, unit = ?, duration_s = ?,
+    elevation_ft = ?, source = ?, source_ref = ?, pace_s = ?
+WHERE id = ?
+RETURNING id
+"""
+
+_DELETE_SQL = "DELETE FROM runs WHERE id = ?"
+
+
+def _run_values(payload: RunCreate) -> Tuple[Tuple[Any, ...], Optional[int], Optional[str]]:
+    """Column values for INSERT/UPDATE (in `_INSERT_SQL` order), plus pace.
+
+    Computes pace_s if not provided in the payload. Only `pace_s` is stored;
+    the `pace` string is always derived from it, so a client-supplied `pace`
+    is not persisted.
+
+    Returns:
+        Tuple: (column values, pace_s, pace)
+    """
+    pace_s = payload.pace_s
+    if pace_s is None and payload.distance > 0 and payload.duration_s > 0:
+        # Same (half-up) rounding as the pace calculator
+        pace_s = pace_from_distance_time(payload.distance, payload.duration_s)
+    pace_s = pace_s or None
+    pace = _sec_to_mmss(pace_s) if pace_s else None
+    # Field types are guaranteed by RunCreate (and REAL/INTEGER column
+    # affinity), so values are bound as-is without float()/int() casts.
+    values = (
+        payload.title,
+        payload.description,
+        payload.started_at.isoformat(),
+        payload.distance,
+        payload.unit.value,  # always a UnitEnum: validated, or built from one
+        payload.duration_s,
+        payload.elevation_ft,
+        payload.source,
+        payload.source_ref,
+        pace_s,
+    )
+    return values, pace_s, pace
+
+
+class DuplicateSourceError(ValueError):
+    """Raised when a write would store a second run for the same (source, source_ref)."""
+
+
+class RunDict(TypedDict):
+    """A run as plain JSON-ready data (same keys and encoding as a serialized `Run`)."""
+
+    id: int
+    title: str
+    description: Optional[str]
+    started_at: str
+    distance: float
+    unit: str
+    duration_s: int
+    run_type: str
+    elevation_ft: Optional[float]
+    source: Optional[str]
+    source_ref: Optional[str]
+    pace_s: Optional[int]
+    pace: Optional[str]
+
+
+# run_type is not persisted, so every stored run reads back with the default
+_DEFAULT_RUN_TYPE: RunTypeEnum = RunCreate.model_fields["run_type"].default
+
+
+def _stored_run(run_id: int, payload: RunCreate, pace_s: Optional[int], pace: Optional[str]) -> Run:
+    """The `Run` that reading back the row just written for `payload` returns.
+
+    Built from the persisted columns only, so write responses match later
+    reads without a second SELECT + validation pass (the payload was
+    validated on ingress).
+    """
+    return Run.model_construct(
+        id=run_id,
+        title=payload.title,
+        description=payload.description,
+        started_at=payload.started_at,
+        distance=payload.distance,
+        unit=payload.unit,
+        duration_s=payload.duration_s,
+        run_type=_DEFAULT_RUN_TYPE,
+        elevation_ft=payload.elevation_ft,
+        source=payload.source,
+        source_ref=payload.source_ref,
+        pace_s=pace_s,
+        pace=pace,
+    )
 
 
 class RunsService:
@@ -70,31 +242,78 @@ class RunsService:
 
     Provides a simple persistence layer backed by SQLite for storing,
     retrieving, creating, and deleting run entries.
+
+    Writes go through one connection (`conn`) serialized by `_lock`; reads
+    use a connection per thread, so with WAL they run concurrently with each
+    other and with the writer instead of queueing on the lock.
     """
 
     def __init__(self) -> None:
         self.conn = _ensure_db()
         self._lock = threading.RLock()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
 
     def close(self) -> None:
-        try:
-            self.conn.close()
-        except Exception:
-            pass
+        with self._lock:
+            conns = [*self._readers, self.conn]
+            self._readers.clear()
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _reader(self) -> sqlite3.Connection:
+        """Return this thread's read connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect()
+            with self._lock:
+                self._readers.append(conn)
+        return conn
 
     # ---------- CRUD ----------
-    def list_runs(self) -> List[Run]:
-        """Retrieve all runs ordered by start time descending.
+    def list_runs(self, limit: Optional[int] = None, offset: int = 0) -> List[Run]:
+        """Retrieve runs ordered by start time descending.
+
+        Args:
+            limit (Optional[int]): Maximum number of runs to return (all if None).
+            offset (int): Number of runs to skip, for pagination.
 
         Returns:
             List[Run]: A list of Run models sorted by started_at descending.
         """
-        with self._lock:
-            cur = self.conn.execute(
-            "SELECT id, title, description, started_at, distance, unit, duration_s, elevation_ft, source, source_ref, pace_s, pace "
-            "FROM runs ORDER BY started_at DESC, id DESC"
-        )
-        items = [self._row_to_model(r) for r in cur.fetchall()]
+        # Iterate the cursor directly rather than materializing fetchall()
+        cur = self._reader().execute(_LIST_SQL, (-1 if limit is None else limit, offset))
+        return [self._row_to_model(r) for r in cur]
+
+    def list_runs_raw(self, limit: Optional[int] = None, offset: int = 0) -> List[RunDict]:
+        """Like `list_runs`, but return plain dicts already in `Run`'s JSON form.
+
+        Skips model hydration entirely (sqlite3.Row -> dict is done in C) for
+        read-only responses; about twice as fast as building and serializing
+        `Run` models for large listings.
+
+        Args:
+            limit (Optional[int]): Maximum number of runs to return (all if None).
+            offset (int): Number of runs to skip, for pagination.
+
+        Returns:
+            List[RunDict]: Runs sorted by started_at descending.
+        """
+        cur = self._reader().execute(_LIST_SQL, (-1 if limit is None else limit, offset))
+        items: List[RunDict] = []
+        for r in cur:
+            item = dict(r)
+            # Match pydantic's datetime output ("...Z" for UTC)
+            started_at = item["started_at"]
+            if started_at.endswith("+00:00"):
+                item["started_at"] = started_at[:-6] + "Z"
+            item["run_type"] = _DEFAULT_RUN_TYPE.value
+            pace_s = item["pace_s"]
+            item["pace"] = _sec_to_mmss(pace_s) if pace_s else None
+            items.append(item)  # type: ignore[arg-type]
         return items
 
     def get(self, run_id: int) -> Optional[Run]:
@@ -106,12 +325,21 @@ class RunsService:
         Returns:
             Optional[Run]: The Run model if found, otherwise None.
         """
-        with self._lock:
-            cur = self.conn.execute(
-            "SELECT id, title, description, started_at, distance, unit, duration_s, elevation_ft, source, source_ref, pace_s, pace "
-            "FROM runs WHERE id = ?",
-            (run_id,),
-        )
+        cur = self._reader().execute(_GET_SQL, (run_id,))
+        row = cur.fetchone()
+        return self._row_to_model(row) if row else None
+
+    def get_by_source(self, source: str, source_ref: str) -> Optional[Run]:
+        """Retrieve the run imported from an external source, if any.
+
+        Args:
+            source (str): The source system (e.g., 'strava').
+            source_ref (str): The reference id in the source system.
+
+        Returns:
+            Optional[Run]: The matching Run model if found, otherwise None.
+        """
+        cur = self._reader().execute(_GET_BY_SOURCE_SQL, (source, source_ref))
         row = cur.fetchone()
         return self._row_to_model(row) if row else None
 
@@ -124,89 +352,87 @@ class RunsService:
             payload (RunCreate): The data for the new run.
 
         Returns:
-            Run: The newly created Run model.
+            Run: The newly created Run model (or the stored run, see
+            `create_or_get_many`).
         """
-        # compute pace if not provided
-        pace_s = payload.pace_s
-        if pace_s is None and payload.distance > 0 and payload.duration_s > 0:
-            pace_s = int(round(payload.duration_s / payload.distance))
-        pace = payload.pace or (_sec_to_mmss(pace_s) if pace_s else None)
+        return self.create_or_get_many([payload])[0][0]
 
-        with self._lock:
-            self.conn.execute(
-            """
-            INSERT INTO runs (title, description, started_at, distance, unit, duration_s, elevation_ft, source, source_ref, pace_s, pace)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                payload.title,
-                payload.description,
-                payload.started_at.isoformat(),
-                float(payload.distance),
-                payload.unit.value if isinstance(payload.unit, UnitEnum) else str(payload.unit),
-                int(payload.duration_s),
-                float(payload.elevation_ft) if payload.elevation_ft is not None else None,
-                payload.source,
-                payload.source_ref,
-                int(pace_s) if pace_s else None,
-                pace,
-            ),
-        )
-        self.conn.commit()
-
-        new_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
-        created = self.get(new_id)
-        assert created is not None
-        return created
-
-    def delete(self, run_id: int) -> None:
+    def create_many(self, payloads: List[RunCreate]) -> List[Run]:
+        """Create several run records in a single transaction.
+
+        One commit for the whole batch instead of one per run, which is what
+        makes bulk imports (e.g. Strava sync) fast.
+
+        Args:
+            payloads (List[RunCreate]): The data for the new runs.
+
+        Returns:
+            List[Run]: The newly created (or already stored) Run models, in
+            payload order.
+        """
+        return [run for run, _ in self.create_or_get_many(payloads)]
+
+    def create_or_get(self, payload: RunCreate) -> Tuple[Run, bool]:
+        """Like `create`, but also report whether a new run was inserted."""
+        return self.create_or_get_many([payload])[0]
+
+    def create_or_get_many(self, payloads: List[RunCreate]) -> List[Tuple[Run, bool]]:
+        """Create several run records in one transaction, skipping known imports.
+
+        A payload whose (source, source_ref) is already stored is not
+        inserted again; the stored run is returned instead. The check is the
+        UNIQUE index itself, so it also holds between concurrent requests.
+
+        Args:
+            payloads (List[RunCreate]): The data for the new runs.
+
+        Returns:
+            List[Tuple[Run, bool]]: ``(run, created)`` per payload, in order.
+        """
+        rows = [_run_values(p) for p in payloads]
+        results: List[Tuple[Run, bool]] = []
+        with self._lock, self.conn:  # commits once, or rolls back on error
+            for p, (values, pace_s, pace) in zip(payloads, rows):
+                # execute per row (not executemany) so each new id is known
+                inserted = self.conn.execute(_INSERT_SQL, values).fetchone()
+                if inserted is not None:
+                    results.append((_stored_run(inserted[0], p, pace_s, pace), True))
+                else:
+                    existing = self.conn.execute(_GET_BY_SOURCE_SQL, (p.source, p.source_ref)).fetchone()
+                    results.append((self._row_to_model(existing), False))
+        return results
+
+    def delete(self, run_id: int) -> bool:
         """Delete a run record by its ID.
 
         Args:
             run_id (int): The ID of the run to delete.
+
+        Returns:
+            bool: True if a run was deleted, False if no run had that ID.
         """
         with self._lock:
-            self.conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+            cur = self.conn.execute(_DELETE_SQL, (run_id,))
             self.conn.commit()
+        return cur.rowcount > 0
 
     def update(self, run_id: int, payload: RunCreate) -> Optional[Run]:
         """Replace a run by ID with new values.
 
-        Returns the updated Run or None if not found.
+        Returns the updated Run or None if not found. Raises
+        `DuplicateSourceError` if another run already has the payload's
+        (source, source_ref).
         """
-        if not self.get(run_id):
+        values, pace_s, pace = _run_values(payload)
+
+        with self._lock, self.conn:  # commits, or rolls back on error
+            try:
+                row = self.conn.execute(_UPDATE_SQL, (*values, run_id)).fetchone()
+            except sqlite3.IntegrityError as e:
+                raise DuplicateSourceError(f"A run from {payload.source} {payload.source_ref} already exists") from e
+        if row is None:
             return None
-
-        pace_s = payload.pace_s
-        if pace_s is None and payload.distance > 0 and payload.duration_s > 0:
-            pace_s = int(round(payload.duration_s / payload.distance))
-        pace = payload.pace or (_sec_to_mmss(pace_s) if pace_s else None)
-
-        with self._lock:
-            self.conn.execute(
-            """
-            UPDATE runs
-            SET title = ?, description = ?, started_at = ?, distance = ?, unit = ?, duration_s = ?,
-                elevation_ft = ?, source = ?, source_ref = ?, pace_s = ?, pace = ?
-            WHERE id = ?
-            """,
-            (
-                payload.title,
-                payload.description,
-                payload.started_at.isoformat(),
-                float(payload.distance),
-                payload.unit.value if isinstance(payload.unit, UnitEnum) else str(payload.unit),
-                int(payload.duration_s),
-                float(payload.elevation_ft) if payload.elevation_ft is not None else None,
-                payload.source,
-                payload.source_ref,
-                int(pace_s) if pace_s else None,
-                pace,
-                run_id,
-            ),
-        )
-        self.conn.commit()
-        return self.get(run_id)
+        return _stored_run(run_id, payload, pace_s, pace)
 
     # ---------- helpers ----------
     def _row_to_model(self, row: sqlite3.Row) -> Run:
@@ -218,18 +444,11 @@ class RunsService:
         Returns:
             Run: The corresponding Run model.
         """
-        data: Dict[str, Any] = dict(row)
-        return Run(
-            id=int(data["id"]),
-            title=data["title"],
-            description=data.get("description"),
-            started_at=data["started_at"],  # pydantic will coerce ISO string → datetime
-            distance=float(data["distance"]),
-            unit=UnitEnum(data["unit"]),
-            duration_s=int(data["duration_s"]),
-            elevation_ft=float(data["elevation_ft"]) if data.get("elevation_ft") is not None else None,
-            source=data.get("source"),
-            source_ref=data.get("source_ref"),
-            pace_s=int(data["pace_s"]) if data["pace_s"] is not None else None,
-            pace=data.get("pace"),
-        )
+        # Column names match the model fields, so validate the row dict in one
+        # pydantic-core call (coercing ISO text -> datetime, 'mi' -> UnitEnum).
+        # Faster here than per-field Python conversions, and than
+        # `model_construct`, whose pure-Python loop loses to core validation.
+        data = dict(row)
+        pace_s = data["pace_s"]
+        data["pace"] = _sec_to_mmss(pace_s) if pace_s else None
+        return Run.model_validate(data)
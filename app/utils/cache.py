@@ -0,0 +1,56 @@
+"""Tiny in-process TTL cache for absorbing repeated upstream lookups."""
+from __future__ import annotations
+
+from time import monotonic
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Map keys to values that expire `ttl` seconds after they are stored.
+
+    Expired entries are dropped lazily when they are read. When `maxsize` is
+    set, storing a new key into a full cache evicts the oldest entry (with a
+    uniform TTL that is also the one closest to expiry). Not thread-safe;
+    intended for use from the event loop.
+
+    Examples:
+        cache = TTLCache(ttl=300, maxsize=1024)
+        cache.set(("athlete", 1), {"id": 1})
+        cache.get(("athlete", 1)) -> {"id": 1}
+    """
+
+    def __init__(self, ttl: float, maxsize: Optional[int] = None) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, V]] = {}
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value, or None if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Store `value` under `key`, (re)starting its TTL."""
+        # Re-insert so dict order stays oldest-first for eviction
+        if self._data.pop(key, None) is None and self.maxsize is not None and len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+        self._data[key] = (monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove `key` and return its value if it had not expired yet."""
+        item = self._data.pop(key, None)
+        if item is None or item[0] <= monotonic():
+            return None
+        return item[1]
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -29,16 +29,17 @@ if parse_pace is None or format_pace is None:
 
 # ---------- TIME (HH:MM:SS) ----------
 
-@pytest.mark.parametrize("time_str,seconds", [
-    ("7:30",        450),      # MM:SS
-    ("00:40:00",    2400),     # HH:MM:SS
-    ("01:00:00",    3600),
-    ("10:59:59",    39599),
-    ("00:00:05",    5),
-    ("0:05",        5),        # MM:SS with single-digit minutes
-])
-def test_parse_time_hhmmss_valid(time_str, seconds):
-    assert parse_time_hhmmss(time_str) == seconds
+def test_parse_time_hhmmss_valid():
+    # One test for the table; the invalid inputs below stay parametrized
+    for time_str, seconds in [
+        ("7:30",        450),      # MM:SS
+        ("00:40:00",    2400),     # HH:MM:SS
+        ("01:00:00",    3600),
+        ("10:59:59",    39599),
+        ("00:00:05",    5),
+        ("0:05",        5),        # MM:SS with single-digit minutes
+    ]:
+        assert parse_time_hhmmss(time_str) == seconds, time_str
 
 
 @pytest.mark.parametrize("seconds,expected", [
@@ -65,7 +66,7 @@ def test_format_time_hhmmss_valid(seconds, expected):
     ":::",           # nonsense
 ])
 def test_parse_time_hhmmss_invalid(bad):
-    with pytest.raises(Exception):
+    with pytest.raises(ValueError):
         parse_time_hhmmss(bad)
 
 
@@ -84,16 +85,16 @@ def test_time_roundtrip(seconds):
 
 # ---------- PACE (MM:SS per unit) ----------
 
-@pytest.mark.parametrize("pace_str,seconds", [
-    ("08:00", 480),
-    ("07:30", 450),
-    ("09:05", 545),
-    ("00:00", 0),
-    ("60:00", 3600),   # minutes may exceed 59; only seconds must be < 60
-    ("0:59", 59),      # single-digit minutes allowed
-])
-def test_parse_pace_mmss_valid(pace_str, seconds):
-    assert parse_pace(pace_str) == seconds
+def test_parse_pace_mmss_valid():
+    for pace_str, seconds in [
+        ("08:00", 480),
+        ("07:30", 450),
+        ("09:05", 545),
+        ("00:00", 0),
+        ("60:00", 3600),   # minutes may exceed 59; only seconds must be < 60
+        ("0:59", 59),      # single-digit minutes allowed
+    ]:
+        assert parse_pace(pace_str) == seconds, pace_str
 
 
 @pytest.mark.parametrize("seconds,expected", [
@@ -108,6 +109,16 @@ def test_format_pace_mmss_valid(seconds, expected):
     assert format_pace(seconds) == expected
 
 
+@pytest.mark.parametrize("seconds,expected", [
+    (44.6,   "00:45"),
+    (479.4,  "07:59"),
+    (479.5,  "08:00"),   # half-up, not banker's rounding
+    (59.5,   "01:00"),   # rounding carries into minutes
+])
+def test_format_pace_mmss_rounds_fractional_seconds(seconds, expected):
+    assert format_pace(seconds) == expected
+
+
 @pytest.mark.parametrize("bad", [
     "8m:00s",
     "8",
@@ -117,7 +128,7 @@ def test_format_pace_mmss_valid(seconds, expected):
     "",          # empty
 ])
 def test_parse_pace_mmss_invalid(bad):
-    with pytest.raises(Exception):
+    with pytest.raises(ValueError):
         parse_pace(bad)
 
 
@@ -1,9 +1,12 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
 
 from app.services import runs as runs_module
-from app.services.runs import RunsService
+from app.services.runs import DuplicateSourceError, RunsService
 from app.models.runs import RunCreate, UnitEnum, RunTypeEnum
 
 
@@ -19,8 +22,6 @@ def temp_service(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
 
 
 def sample_payload(i: int = 1) -> RunCreate:
-    from datetime import datetime, timezone
-
     return RunCreate(
         title=f"Run {i}",
         description="test",
@@ -36,20 +37,183 @@ def sample_payload(i: int = 1) -> RunCreate:
 def test_create_get_update_delete(temp_service: RunsService):
     svc = temp_service
 
-    # create
-    created = svc.create(sample_payload())
+    # create (run_type is not stored, so the result carries the default, as reads do)
+    created = svc.create(sample_payload().model_copy(update={"run_type": RunTypeEnum.workout}))
     assert created.id > 0
     assert created.pace_s is not None
+    assert created == svc.get(created.id)
 
     # get
     fetched = svc.get(created.id)
     assert fetched is not None and fetched.id == created.id
 
     # update
-    updated = svc.update(created.id, sample_payload(2))
+    updated = svc.update(created.id, sample_payload(2).model_copy(update={"run_type": RunTypeEnum.race}))
     assert updated is not None and updated.title == "Run 2"
+    assert updated == svc.get(created.id)
+    assert svc.update(created.id + 1, sample_payload(3)) is None
 
     # delete
-    svc.delete(created.id)
+    assert svc.delete(created.id) is True
     assert svc.get(created.id) is None
+    assert svc.delete(created.id) is False
+
+
+def test_pace_matches_pace_calculator(temp_service: RunsService):
+    # 481 s over 2 mi is 240.5 s/mi; stored pace rounds half-up like /pace-calc
+    run = temp_service.create(sample_payload().model_copy(update={"distance": 2.0, "duration_s": 481}))
+    assert run.pace_s == 241 and run.pace == "04:01"
+    assert temp_service.get(run.id).pace_s == 241
+
+
+def test_get_by_source(temp_service: RunsService):
+    svc = temp_service
+
+    payload = sample_payload().model_copy(update={"source": "strava", "source_ref": "123"})
+    created = svc.create(payload)
+    svc.create(sample_payload(2))
+
+    found = svc.get_by_source("strava", "123")
+    assert found is not None and found.id == created.id
+    assert svc.get_by_source("strava", "999") is None
+
+
+def test_create_existing_source_returns_stored_run(temp_service: RunsService):
+    svc = temp_service
+    payload = sample_payload().model_copy(update={"source": "strava", "source_ref": "123"})
+
+    first, created = svc.create_or_get(payload)
+    assert created is True
+    again, created = svc.create_or_get(payload.model_copy(update={"title": "Retry"}))
+    assert created is False and again == first
+
+    # Within one batch, too; runs without a source are never deduped
+    (dup, dup_created), *rest = svc.create_or_get_many([payload, sample_payload(2), sample_payload(2)])
+    assert dup.id == first.id and dup_created is False
+    assert [c for _, c in rest] == [True, True]
+    assert len(svc.list_runs()) == 3
+
+
+def test_update_to_existing_source_raises(temp_service: RunsService):
+    svc = temp_service
+    imported = svc.create(sample_payload().model_copy(update={"source": "strava", "source_ref": "123"}))
+    other = svc.create(sample_payload(2))
+
+    with pytest.raises(DuplicateSourceError):
+        svc.update(other.id, sample_payload(2).model_copy(update={"source": "strava", "source_ref": "123"}))
+    assert svc.get(other.id) == other and svc.get(imported.id) == imported
+
+
+def test_create_many(temp_service: RunsService):
+    svc = temp_service
+
+    created = svc.create_many([sample_payload(i) for i in range(1, 4)])
+    assert [r.title for r in created] == ["Run 1", "Run 2", "Run 3"]
+    assert len({r.id for r in created}) == 3
+    for r in created:
+        fetched = svc.get(r.id)
+        assert fetched is not None and fetched.title == r.title and fetched.pace == r.pace
+
+    assert svc.create_many([]) == []
+
+
+def test_reads_from_other_threads_see_committed_writes(temp_service: RunsService):
+    svc = temp_service
+    created = svc.create(sample_payload())
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda _: svc.get(created.id), range(4)))
+    assert all(r is not None and r.id == created.id for r in results)
+
+    svc.delete(created.id)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(svc.get, created.id).result() is None
+
 
+def test_list_runs_pagination(temp_service: RunsService):
+    svc = temp_service
+    svc.create_many([sample_payload(i) for i in range(1, 6)])
+
+    all_runs = svc.list_runs()
+    assert len(all_runs) == 5
+    assert [r.id for r in svc.list_runs(limit=2, offset=1)] == [r.id for r in all_runs[1:3]]
+    assert svc.list_runs(offset=5) == []
+
+
+def test_list_runs_raw_matches_serialized_models(temp_service: RunsService):
+    svc = temp_service
+    svc.create(sample_payload(1))
+    svc.create(sample_payload(2).model_copy(update={"source": "strava", "source_ref": "9", "elevation_ft": None}))
+    svc.create(sample_payload(3).model_copy(update={"started_at": datetime.fromisoformat("2024-05-01T07:00:00+02:00")}))
+
+    expected = [r.model_dump(mode="json") for r in svc.list_runs()]
+    assert svc.list_runs_raw() == expected
+    assert svc.list_runs_raw(limit=1, offset=1) == expected[1:2]
+
+
+def test_legacy_pace_column_is_dropped(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    db = tmp_path / "app.db"
+    legacy = sqlite3.connect(db)
+    legacy.execute(
+        "CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT, "
+        "started_at TEXT NOT NULL, distance REAL NOT NULL, unit TEXT NOT NULL DEFAULT 'mi', "
+        "duration_s INTEGER NOT NULL, elevation_ft REAL, source TEXT, source_ref TEXT, pace_s INTEGER, pace TEXT)"
+    )
+    legacy.execute(
+        "INSERT INTO runs (title, started_at, distance, unit, duration_s, pace_s, pace) "
+        "VALUES ('Old', '2025-09-10T07:15:00+00:00', 5.0, 'mi', 2400, 480, '08:00')"
+    )
+    legacy.commit()
+    legacy.close()
+
+    monkeypatch.setattr(runs_module, "_DB_PATH", db)
+    svc = RunsService()
+    try:
+        cols = [c[1] for c in svc.conn.execute("PRAGMA table_info(runs)")]
+        assert "pace" not in cols
+        (run,) = svc.list_runs()
+        assert run.title == "Old" and run.pace_s == 480 and run.pace == "08:00"
+    finally:
+        svc.close()
+
+
+def test_duplicate_imports_are_reported_not_deleted_on_startup(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    db = tmp_path / "app.db"
+    legacy = sqlite3.connect(db)
+    legacy.execute(
+        "CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT, "
+        "started_at TEXT NOT NULL, distance REAL NOT NULL, unit TEXT NOT NULL DEFAULT 'mi', "
+        "duration_s INTEGER NOT NULL, elevation_ft REAL, source TEXT, source_ref TEXT, pace_s INTEGER)"
+    )
+    legacy.executemany(
+        "INSERT INTO runs (title, started_at, distance, duration_s, source, source_ref) "
+        "VALUES (?, '2025-09-10T07:15:00+00:00', 5.0, 2400, ?, ?)",
+        [("First", "strava", "1"), ("Dup", "strava", "1"), ("Manual", None, None), ("Manual", None, None)],
+    )
+    legacy.commit()
+    legacy.close()
+    monkeypatch.setattr(runs_module, "_DB_PATH", db)
+
+    # Duplicates are kept and logged; the UNIQUE index waits until they're resolved
+    with caplog.at_level("WARNING", logger=runs_module.__name__):
+        svc = RunsService()
+    try:
+        assert sorted(r.title for r in svc.list_runs()) == ["Dup", "First", "Manual", "Manual"]
+        assert svc.get_by_source("strava", "1").title == "First"
+        assert "strava/1: 1,2" in caplog.text
+        dup = next(r for r in svc.list_runs() if r.title == "Dup")
+        assert svc.delete(dup.id)
+    finally:
+        svc.close()
+
+    caplog.clear()
+    svc = RunsService()
+    try:
+        assert caplog.text == ""
+        manual = next(r for r in svc.list_runs() if r.source is None)
+        with pytest.raises(DuplicateSourceError):  # now enforced
+            svc.update(manual.id, sample_payload().model_copy(update={"source": "strava", "source_ref": "1"}))
+    finally:
+        svc.close()
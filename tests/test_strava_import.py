@@ -0,0 +1,199 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import strava as strava_api
+from app.main import app
+from app.models.runs import RunCreate
+from app.services import runs as runs_module
+from app.services.runs import RunsService
+from app.utils.cache import TTLCache
+
+ATHLETE_ID = 1
+
+
+class FakeStrava:
+    """Stands in for the shared Strava httpx client; serves activity details."""
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.completed: List[int] = []
+        # Seconds each successful activity fetch takes
+        self.delay = 0.0
+        # Served as page 1 of /athlete/activities (later pages are empty)
+        self.listing: List[dict] = []
+        self.failing: set = set()
+        # Runs during a fetch, e.g. to simulate a concurrent request
+        self.on_fetch: Optional[Callable[[int], None]] = None
+
+    async def get(self, url: str, params: Optional[dict] = None, **kwargs) -> httpx.Response:
+        self.calls.append(url)
+        if url.endswith("/athlete/activities"):
+            return httpx.Response(200, json=self.listing if params["page"] == 1 else [])
+        activity_id = int(url.rsplit("/", 1)[1])
+        if self.on_fetch:
+            self.on_fetch(activity_id)
+        if activity_id in self.failing:
+            return httpx.Response(404, json={"message": "Record Not Found"})
+        await asyncio.sleep(self.delay)
+        self.completed.append(activity_id)
+        return httpx.Response(
+            200,
+            json={
+                "name": f"Run {activity_id}",
+                "distance": 8046.72,  # 5 mi
+                "moving_time": 2400,
+                "total_elevation_gain": 30.0,
+                "start_date": "2025-09-10T11:15:00Z",
+                "start_date_local": "2025-09-10T07:15:00Z",
+            },
+        )
+
+
+@pytest.fixture(scope="module")
+def app_client(tmp_path_factory: pytest.TempPathFactory):
+    """One app startup (lifespan) shared by the module's tests."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(runs_module, "_DB_PATH", tmp_path_factory.mktemp("app") / "app.db")
+        mp.setitem(
+            strava_api._TOKEN_STORE,
+            ATHLETE_ID,
+            {"access_token": "token", "refresh_token": "refresh", "expires_at": 2**31, "athlete": {}},
+        )
+        with TestClient(app) as c:
+            yield c
+
+
+@pytest.fixture()
+def fake_strava(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(strava_api, "_ACTIVITY_CACHE", TTLCache(ttl=300))
+    fake = FakeStrava()
+    app.dependency_overrides[strava_api.get_http_client] = lambda: fake
+    try:
+        yield fake
+    finally:
+        app.dependency_overrides.pop(strava_api.get_http_client, None)
+
+
+@pytest.fixture()
+def client(app_client: TestClient, fake_strava: FakeStrava, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """The shared client, serving a fresh database for each test."""
+    monkeypatch.setattr(runs_module, "_DB_PATH", tmp_path / "app.db")
+    svc = RunsService()
+    monkeypatch.setattr(app_client.app.state, "runs_service", svc)
+    try:
+        yield app_client
+    finally:
+        svc.close()
+
+
+def test_import_from_strava_then_reimport(client: TestClient, fake_strava: FakeStrava):
+    r = client.post("/runs/from-strava", json={"activity_id": 11, "athlete_id": ATHLETE_ID})
+    assert r.status_code == 201
+    run = r.json()
+    assert run["title"] == "Run 11" and run["source_ref"] == "11" and run["distance"] == 5.0
+
+    again = client.post("/runs/from-strava", json={"activity_id": 11, "athlete_id": ATHLETE_ID})
+    assert again.status_code == 200 and again.json() == run
+    assert fake_strava.calls == ["/api/v3/activities/11"]  # re-import doesn't call Strava
+    assert client.get(f"/runs/{run['id']}").json() == run
+
+
+def test_import_racing_another_import_returns_stored_run(client: TestClient, fake_strava: FakeStrava):
+    svc = client.app.state.runs_service
+    # Another request stores the activity while this one is still fetching it
+    fake_strava.on_fetch = lambda activity_id: svc.create(
+        RunCreate(
+            title="Other import",
+            started_at="2025-09-10T07:15:00Z",
+            distance=5.0,
+            duration_s=2400,
+            source="strava",
+            source_ref=str(activity_id),
+        )
+    )
+
+    r = client.post("/runs/from-strava", json={"activity_id": 11, "athlete_id": ATHLETE_ID})
+    assert r.status_code == 200 and r.json()["title"] == "Other import"
+    assert len(client.get("/runs").json()) == 1
+
+
+def test_batch_import_dedupes_ids(client: TestClient, fake_strava: FakeStrava):
+    r = client.post("/runs/from-strava/batch", json={"activity_ids": [21, 22, 21], "athlete_id": ATHLETE_ID})
+    assert r.status_code == 201
+    assert [run["source_ref"] for run in r.json()] == ["21", "22"]
+    assert sorted(fake_strava.calls) == ["/api/v3/activities/21", "/api/v3/activities/22"]
+    assert len(client.get("/runs").json()) == 2
+
+
+def test_batch_import_returns_already_imported_runs(client: TestClient, fake_strava: FakeStrava):
+    first = client.post("/runs/from-strava", json={"activity_id": 21, "athlete_id": ATHLETE_ID}).json()
+
+    r = client.post("/runs/from-strava/batch", json={"activity_ids": [21, 22], "athlete_id": ATHLETE_ID})
+    assert r.status_code == 201
+    assert r.json()[0] == first
+    assert fake_strava.calls == ["/api/v3/activities/21", "/api/v3/activities/22"]
+
+    # Nothing left to create: 200, and Strava isn't called again
+    again = client.post("/runs/from-strava/batch", json={"activity_ids": [22, 21], "athlete_id": ATHLETE_ID})
+    assert again.status_code == 200
+    assert [run["source_ref"] for run in again.json()] == ["22", "21"]
+    assert len(fake_strava.calls) == 2
+
+
+def test_batch_import_failing_fetch_stores_nothing(client: TestClient, fake_strava: FakeStrava):
+    fake_strava.failing.add(32)
+    r = client.post("/runs/from-strava/batch", json={"activity_ids": [31, 32, 33], "athlete_id": ATHLETE_ID})
+    assert r.status_code == 502
+    assert r.json()["detail"]["reason"] == "strava_activity_fetch_failed"
+    assert client.get("/runs").json() == []
+
+
+def test_batch_import_failure_cancels_pending_fetches(client: TestClient, fake_strava: FakeStrava):
+    fake_strava.failing.add(32)
+    fake_strava.delay = 0.2
+    r = client.post("/runs/from-strava/batch", json={"activity_ids": [31, 32, 33], "athlete_id": ATHLETE_ID})
+    assert r.status_code == 502
+    time.sleep(0.3)  # long enough for any fetch left running to finish
+    assert fake_strava.completed == []
+    assert len(strava_api._ACTIVITY_CACHE) == 0
+
+
+def test_manual_run_with_imported_source_conflicts(client: TestClient, fake_strava: FakeStrava):
+    imported = client.post("/runs/from-strava", json={"activity_id": 41, "athlete_id": ATHLETE_ID}).json()
+    body = {
+        "title": "new",
+        "started_at": "2025-09-11T07:00:00Z",
+        "distance": 3.0,
+        "duration_s": 1500,
+        "source": "strava",
+        "source_ref": "41",
+    }
+
+    assert client.post("/runs", json=body).status_code == 409
+
+    manual = client.post("/runs", json={**body, "source": None, "source_ref": None}).json()
+    assert client.put(f"/runs/{manual['id']}", json=body).status_code == 409
+    assert client.get(f"/runs/{manual['id']}").json() == manual
+    assert client.get(f"/runs/{imported['id']}").json() == imported
+
+
+def test_sync_counts_only_runs_it_stores(client: TestClient, fake_strava: FakeStrava):
+    fake_strava.listing = [
+        {"id": 50 + i, "type": "Run", "distance": 8046.72, "moving_time": 2400 + 60 * i,
+         "start_date_local": "2025-09-10T07:15:00Z"}
+        for i in range(3)
+    ]
+    first = client.post("/api/strava/sync", params={"athlete_id": ATHLETE_ID}).json()
+    assert first["summary"] == {"imported": 3, "already": 0, "would_import": 0, "errors": 0}
+
+    # Stored runs match the listing by source now, not (only) by the day heuristic
+    again = client.post("/api/strava/sync", params={"athlete_id": ATHLETE_ID}).json()
+    assert again["summary"] == {"imported": 0, "already": 3, "would_import": 0, "errors": 0}
+    assert sorted(again["already_ids"]) == [50, 51, 52]
+    assert len(client.get("/runs").json()) == 3
@@ -0,0 +1,58 @@
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_value_until_ttl_elapses(clock):
+    cache: TTLCache[str] = TTLCache(ttl=60)
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+
+    clock[0] += 59
+    assert cache.get("k") == "v"
+
+    clock[0] += 1
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_set_restarts_ttl(clock):
+    cache: TTLCache[int] = TTLCache(ttl=10)
+    cache.set("k", 1)
+    clock[0] += 8
+    cache.set("k", 2)
+    clock[0] += 8
+    assert cache.get("k") == 2
+
+
+def test_pop_ignores_expired_entries(clock):
+    cache: TTLCache[int] = TTLCache(ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+
+    clock[0] += 10
+    assert cache.pop("b") is None
+    assert len(cache) == 0
+
+
+def test_maxsize_evicts_oldest_entry(clock):
+    cache: TTLCache[int] = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)  # refresh moves "a" behind "b"
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 10
+    assert cache.get("c") == 3